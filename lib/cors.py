@@ -0,0 +1,118 @@
+from typing import Sequence
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+ALL_METHODS = ("DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT")
+SAFELISTED_HEADERS = {"accept", "accept-language", "content-language", "content-type"}
+
+
+class PureASGICors:
+    """CORS handling as a plain ASGI app: preflights are answered inline and
+    simple responses only get headers appended on ``http.response.start``."""
+
+    _PREFLIGHT_BODY = b""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allow_origins: Sequence[str] = (),
+        allow_methods: Sequence[str] = ("GET",),
+        allow_headers: Sequence[str] = (),
+        allow_credentials: bool = False,
+    ):
+        self.app = app
+        self.allow_all_origins = "*" in allow_origins
+        self.allow_origins = {origin.encode() for origin in allow_origins}
+        self.allow_all_headers = "*" in allow_headers
+        self.allow_headers = SAFELISTED_HEADERS | {h.lower() for h in allow_headers if h != "*"}
+        methods = ALL_METHODS if "*" in allow_methods else tuple(m.upper() for m in allow_methods)
+        self.allow_methods = {m.encode() for m in methods}
+        self.echo_origin = allow_credentials or not self.allow_all_origins
+
+        shared_headers = []
+        if allow_credentials:
+            shared_headers.append((b"access-control-allow-credentials", b"true"))
+        if self.echo_origin:
+            shared_headers.append((b"vary", b"Origin"))
+        self.simple_headers = shared_headers
+
+        self.preflight_headers = [
+            *shared_headers,
+            (b"access-control-allow-methods", ", ".join(methods).encode()),
+            (b"access-control-max-age", b"600"),
+        ]
+        self.preflight_allow_headers = ", ".join(sorted(self.allow_headers)).encode()
+
+    def is_allowed_origin(self, origin: bytes) -> bool:
+        return self.allow_all_origins or origin in self.allow_origins
+
+    def allow_origin_header(self, origin: bytes):
+        return (b"access-control-allow-origin", origin if self.echo_origin else b"*")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = request_method = request_headers = None
+        for key, value in scope["headers"]:
+            if key == b"origin":
+                origin = value
+            elif key == b"access-control-request-method":
+                request_method = value
+            elif key == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self.preflight_response(send, origin, request_method, request_headers)
+            return
+
+        if not self.is_allowed_origin(origin):
+            await self.app(scope, receive, send)
+            return
+
+        extra_headers = [*self.simple_headers, self.allow_origin_header(origin)]
+
+        async def send_with_cors(message: Message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *extra_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def preflight_response(self, send: Send, origin: bytes, request_method: bytes, request_headers):
+        headers = list(self.preflight_headers)
+        failures = []
+
+        if self.is_allowed_origin(origin):
+            headers.append(self.allow_origin_header(origin))
+        else:
+            failures.append(b"origin")
+
+        if request_method.upper() not in self.allow_methods:
+            failures.append(b"method")
+
+        if self.allow_all_headers and request_headers is not None:
+            headers.append((b"access-control-allow-headers", request_headers))
+        else:
+            if request_headers:
+                for header in request_headers.decode("latin-1").split(","):
+                    if header.strip().lower() not in self.allow_headers:
+                        failures.append(b"headers")
+                        break
+            headers.append((b"access-control-allow-headers", self.preflight_allow_headers))
+
+        if failures:
+            status, body = 400, b"Disallowed CORS " + b", ".join(failures)
+            headers.append((b"content-type", b"text/plain; charset=utf-8"))
+        else:
+            status, body = 200, self._PREFLIGHT_BODY
+        headers.append((b"content-length", str(len(body)).encode()))
+
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
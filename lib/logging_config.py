@@ -0,0 +1,31 @@
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue
+
+_listener = None
+
+
+def configure_logging(level: int = logging.INFO):
+    """Route root logging through a queue so the event loop never blocks on
+    stream writes; a background listener thread does the actual I/O."""
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue = Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
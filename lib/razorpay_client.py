@@ -1,5 +1,5 @@
 import os
-import razorpay
+import httpx
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -10,9 +10,12 @@ key_secret = (os.environ.get("RAZORPAY_KEY_SECRET") or "").strip()
 if not key_id or not key_secret:
     raise RuntimeError("RAZORPAY_KEY_ID and RAZORPAY_KEY_SECRET are required")
 
-client = razorpay.Client(
-    auth=(
-        key_id,
-        key_secret
-    )
+# Shared async client: keep-alive HTTP/2 connections to Razorpay, and the
+# event loop stays free while a request is in flight.
+client = httpx.AsyncClient(
+    base_url="https://api.razorpay.com/v1",
+    auth=(key_id, key_secret),
+    http2=True,
+    timeout=10.0,
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
 )
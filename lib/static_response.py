@@ -0,0 +1,17 @@
+from starlette.types import Receive, Scope, Send
+
+
+class StaticResponse:
+    """ASGI endpoint that always answers with the same pre-encoded bytes."""
+
+    def __init__(self, body: bytes, media_type: str = "application/json", status: int = 200):
+        self.body = body
+        self.status = status
+        self.headers = [
+            (b"content-type", media_type.encode()),
+            (b"content-length", str(len(body)).encode()),
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await send({"type": "http.response.start", "status": self.status, "headers": self.headers})
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else self.body})
@@ -5,7 +5,7 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, Response
 
-from server import Order, build_order_date_query, db, get_admin, normalize_order_doc
+from server import ORDER_LIST, build_order_date_query, db, get_admin, normalize_order_doc
 
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
@@ -19,7 +19,7 @@ async def export_orders_csv(
 ):
     order_query = build_order_date_query(start_date, end_date)
     orders = await db.orders.find(order_query, {"_id": 0}).sort("created_at", -1).to_list(5000)
-    normalized_orders = [Order(**normalize_order_doc(order)) for order in orders]
+    normalized_orders = ORDER_LIST.validate_python([normalize_order_doc(order) for order in orders])
 
     output = io.StringIO()
     writer = csv.writer(output)
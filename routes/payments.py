@@ -1,29 +1,43 @@
-import os
+import logging
 import uuid
-import hmac
-import hashlib
+from typing import Annotated
 
+import msgspec
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, hmac
 from fastapi import APIRouter, HTTPException, Request
-from pydantic import BaseModel, Field
 
 from lib.rate_limiter import limiter
-from lib.razorpay_client import client
+from lib.razorpay_client import client, key_secret
 
 router = APIRouter(prefix="/api/payments", tags=["Payments"])
+logger = logging.getLogger(__name__)
 
+SECRET_BYTES = key_secret.encode()
+# Keyed once at import; copying it per request reuses the padded-key state.
+_HMAC_TEMPLATE = hmac.HMAC(SECRET_BYTES, hashes.SHA256())
 
-class PaymentOrderItem(BaseModel):
+
+class PaymentOrderItem(msgspec.Struct):
     menu_item_id: str
-    quantity: int = Field(gt=0)
+    quantity: Annotated[int, msgspec.Meta(gt=0)]
 
 
-class CreateOrderPayload(BaseModel):
+class CreateOrderPayload(msgspec.Struct):
     items: list[PaymentOrderItem]
 
 
+async def decode_payload(request: Request, payload_type):
+    try:
+        return msgspec.json.decode(await request.body(), type=payload_type)
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
 @router.post("/create-order")
 @limiter.limit("10/minute")
-async def create_razorpay_order(payload: CreateOrderPayload, request: Request):
+async def create_razorpay_order(request: Request):
+    payload = await decode_payload(request, CreateOrderPayload)
     if not payload.items:
         raise HTTPException(status_code=400, detail="Cart is empty")
 
@@ -52,14 +66,17 @@ async def create_razorpay_order(payload: CreateOrderPayload, request: Request):
         raise HTTPException(status_code=400, detail="Invalid order amount")
 
     try:
-        order = client.order.create(
-            {
+        razorpay_response = await client.post(
+            "/orders",
+            json={
                 "amount": amount_paise,
                 "currency": "INR",
                 "receipt": f"receipt_{uuid.uuid4().hex[:12]}",
                 "payment_capture": 1,
-            }
+            },
         )
+        razorpay_response.raise_for_status()
+        order = razorpay_response.json()
 
         return {
             "order_id": order["id"],
@@ -68,39 +85,31 @@ async def create_razorpay_order(payload: CreateOrderPayload, request: Request):
         }
     except HTTPException:
         raise
-    except Exception as e:
-        print("RAZORPAY ERROR:", repr(e))
+    except Exception:
+        logger.exception("Razorpay order creation failed")
         raise HTTPException(
             status_code=500,
             detail="Razorpay order creation failed",
         )
 
 
-class VerifyPaymentPayload(BaseModel):
+class VerifyPaymentPayload(msgspec.Struct):
     razorpay_order_id: str
     razorpay_payment_id: str
     razorpay_signature: str
 
 
 @router.post("/verify")
-def verify_payment(payload: VerifyPaymentPayload):
-    secret = os.environ.get("RAZORPAY_KEY_SECRET")
-
-    if not secret:
-        raise HTTPException(
-            status_code=500,
-            detail="Razorpay secret not configured"
-        )
-
+async def verify_payment(request: Request):
+    payload = await decode_payload(request, VerifyPaymentPayload)
     message = f"{payload.razorpay_order_id}|{payload.razorpay_payment_id}"
 
-    expected_signature = hmac.new(
-        secret.encode(),
-        message.encode(),
-        hashlib.sha256
-    ).hexdigest()
+    signature = _HMAC_TEMPLATE.copy()
+    signature.update(message.encode())
 
-    if expected_signature != payload.razorpay_signature:
+    try:
+        signature.verify(bytes.fromhex(payload.razorpay_signature))
+    except (ValueError, InvalidSignature):
         raise HTTPException(
             status_code=400,
             detail="Payment verification failed"
@@ -109,3 +118,8 @@ def verify_payment(payload: VerifyPaymentPayload):
     return {
         "status": "verified"
     }
+
+
+@router.on_event("shutdown")
+async def close_razorpay_client():
+    await client.aclose()
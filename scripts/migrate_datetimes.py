@@ -0,0 +1,61 @@
+"""One-off migration: convert ISO-string timestamps to native BSON dates.
+
+Older rows stored ``created_at``/``updated_at`` (or the legacy camelCase
+``createdAt``/``updatedAt``) as ISO strings, which the analytics and date
+range queries cannot compare against ``datetime`` values. Run once with the
+same environment as the server:
+
+    python -m scripts.migrate_datetimes
+"""
+import os
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+COLLECTIONS = ("users", "menu_items", "orders", "testimonials")
+LEGACY_FIELDS = {"createdAt": "created_at", "updatedAt": "updated_at"}
+
+
+def migrate(db):
+    for name in COLLECTIONS:
+        collection = db[name]
+
+        for legacy, field in LEGACY_FIELDS.items():
+            result = collection.update_many(
+                {legacy: {"$exists": True}, field: {"$exists": False}},
+                {"$rename": {legacy: field}},
+            )
+            if result.modified_count:
+                print(f"{name}: renamed {legacy} -> {field} on {result.modified_count} docs")
+
+        for field in LEGACY_FIELDS.values():
+            result = collection.update_many(
+                {field: {"$type": "string"}},
+                # Unparsable strings are left as they are rather than failing
+                # the whole batch; the read path falls back for those rows.
+                [{"$set": {field: {"$convert": {
+                    "input": f"${field}",
+                    "to": "date",
+                    "onError": f"${field}",
+                    "onNull": None,
+                }}}}],
+            )
+            if result.modified_count:
+                print(f"{name}: converted {field} on {result.modified_count} docs")
+
+            remaining = collection.count_documents({field: {"$type": "string"}})
+            if remaining:
+                print(f"{name}: {remaining} docs still have an unparsable {field}")
+
+
+def main():
+    load_dotenv()
+    client = MongoClient(os.environ["MONGO_URL"].strip(), tls=True)
+    try:
+        migrate(client[os.environ["DB_NAME"].strip()])
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()